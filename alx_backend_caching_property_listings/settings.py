@@ -140,6 +140,7 @@ CACHES = {
         'LOCATION': 'redis://redis:6379/1',
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'COMPRESSOR': 'django_redis.compressors.lz4.Lz4Compressor',
         },
         'KEY_PREFIX': 'property_listings',
     }
@@ -1,9 +1,12 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from properties.models import Property
+from properties.signals import bulk_cache_invalidation
 
 class Command(BaseCommand):
     help = 'Seed the database with sample properties'
 
+    @transaction.atomic
     def handle(self, *args, **options):
         properties = [
             {
@@ -38,16 +41,28 @@ class Command(BaseCommand):
             }
         ]
 
-        for prop_data in properties:
-            property, created = Property.objects.get_or_create(
-                title=prop_data['title'],
-                defaults=prop_data
+        titles = [prop_data['title'] for prop_data in properties]
+        existing_titles = set(
+            Property.objects.filter(title__in=titles).values_list('title', flat=True)
+        )
+
+        with bulk_cache_invalidation():
+            Property.objects.bulk_create(
+                [
+                    Property(**prop_data)
+                    for prop_data in properties
+                    if prop_data['title'] not in existing_titles
+                ],
+                ignore_conflicts=True,
+                batch_size=1000,
             )
-            if created:
+
+        for title in titles:
+            if title not in existing_titles:
                 self.stdout.write(
-                    self.style.SUCCESS(f'Created property: {prop_data["title"]}')
+                    self.style.SUCCESS(f'Created property: {title}')
                 )
             else:
                 self.stdout.write(
-                    self.style.WARNING(f'Property already exists: {prop_data["title"]}')
+                    self.style.WARNING(f'Property already exists: {title}')
                 )
\ No newline at end of file
@@ -13,4 +13,7 @@ class Property(models.Model):
     
     class Meta:
         verbose_name_plural = "Properties"
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='properties_created_at_idx'),
+        ]
\ No newline at end of file
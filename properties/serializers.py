@@ -0,0 +1,44 @@
+from datetime import datetime
+from decimal import Decimal
+
+import msgpack
+
+# msgpack extension type codes for values it cannot encode natively
+DECIMAL_EXT_TYPE = 1
+DATETIME_EXT_TYPE = 2
+
+
+def _encode_ext(obj):
+    """
+    Encode Decimal and datetime values (model prices and timestamps) as msgpack extensions
+    """
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(DECIMAL_EXT_TYPE, str(obj).encode())
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(DATETIME_EXT_TYPE, obj.isoformat().encode())
+    raise TypeError(f"Cannot serialize {type(obj).__name__} to msgpack")
+
+
+def _decode_ext(code, data):
+    """
+    Restore values encoded by _encode_ext
+    """
+    if code == DECIMAL_EXT_TYPE:
+        return Decimal(data.decode())
+    if code == DATETIME_EXT_TYPE:
+        return datetime.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+def pack_properties(rows):
+    """
+    Encode cached property rows (dicts of model field values) as msgpack bytes
+    """
+    return msgpack.packb(rows, default=_encode_ext, use_bin_type=True)
+
+
+def unpack_properties(data):
+    """
+    Decode bytes produced by pack_properties back into property rows
+    """
+    return msgpack.unpackb(data, ext_hook=_decode_ext, raw=False)
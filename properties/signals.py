@@ -1,58 +1,80 @@
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
-from django.core.cache import cache
+from django.db import transaction
 from .models import Property
+from .utils import clear_properties_cache
+from contextlib import contextmanager
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Per-thread flag set while a bulk write is in progress
+_bulk_mode = threading.local()
+
+@contextmanager
+def bulk_cache_invalidation():
+    """
+    Suppress per-instance cache invalidation for the duration of a bulk write
+    and clear the properties cache once when the transaction commits
+    """
+    previous = getattr(_bulk_mode, 'active', False)
+    _bulk_mode.active = True
+    try:
+        yield
+    finally:
+        _bulk_mode.active = previous
+    transaction.on_commit(clear_properties_cache)
+
 @receiver(post_save, sender=Property)
 def invalidate_cache_on_save(sender, instance, **kwargs):
     """
     Invalidate the all_properties cache when a Property is created or updated
     """
-    cache_key = 'all_properties'
+    if getattr(_bulk_mode, 'active', False):
+        return
     
-    try:
-        # Check if cache key exists before deleting
-        if cache.has_key(cache_key):
-            cache.delete(cache_key)
-            logger.info(f"✅ Cache invalidated due to {instance} being {'created' if kwargs.get('created') else 'updated'}")
-        else:
-            logger.info(f"ℹ️  Cache key '{cache_key}' not found during {instance} save")
-            
-    except Exception as e:
-        logger.error(f"❌ Error invalidating cache on save: {e}")
+    # clear_properties_cache() logs its own errors and returns None for them
+    deleted = clear_properties_cache()
+    if deleted:
+        logger.info("Cache invalidated: %s created=%s", instance, kwargs.get('created'))
+    elif deleted is not None:
+        logger.info("Cache key 'all_properties' not found during %s save", instance)
 
 @receiver(post_delete, sender=Property)
 def invalidate_cache_on_delete(sender, instance, **kwargs):
     """
     Invalidate the all_properties cache when a Property is deleted
     """
-    cache_key = 'all_properties'
+    if getattr(_bulk_mode, 'active', False):
+        return
     
-    try:
-        # Check if cache key exists before deleting
-        if cache.has_key(cache_key):
-            cache.delete(cache_key)
-            logger.info(f"✅ Cache invalidated due to {instance} being deleted")
-        else:
-            logger.info(f"ℹ️  Cache key '{cache_key}' not found during {instance} deletion")
-            
-    except Exception as e:
-        logger.error(f"❌ Error invalidating cache on delete: {e}")
+    deleted = clear_properties_cache()
+    if deleted:
+        logger.info("Cache invalidated: %s deleted", instance)
+    elif deleted is not None:
+        logger.info("Cache key 'all_properties' not found during %s deletion", instance)
 
 @receiver(pre_save, sender=Property)
 def log_property_changes(sender, instance, **kwargs):
     """
     Log changes when a Property is updated (optional, for debugging)
     """
+    # The lookup below only feeds log output, so skip it when INFO is filtered
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     if instance.pk:  # Only for updates, not creations
+        # Skip the lookup when the save is limited to fields we don't log
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not {'title', 'price'} & set(update_fields):
+            return
+        
         try:
-            old_instance = Property.objects.get(pk=instance.pk)
+            old_instance = Property.objects.only('title', 'price').get(pk=instance.pk)
             if old_instance.title != instance.title:
-                logger.info(f"Property title changed from '{old_instance.title}' to '{instance.title}'")
+                logger.info("Property title changed from '%s' to '%s'", old_instance.title, instance.title)
             if old_instance.price != instance.price:
-                logger.info(f"Property price changed from {old_instance.price} to {instance.price}")
+                logger.info("Property price changed from %s to %s", old_instance.price, instance.price)
         except Property.DoesNotExist:
             pass
\ No newline at end of file
@@ -1,3 +1,154 @@
-from django.test import TestCase
+from datetime import datetime, timezone
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .models import Property
+from .serializers import pack_properties, unpack_properties
+from . import utils
+from .utils import (
+    PROPERTIES_COUNT_CACHE_KEY,
+    PROPERTIES_REFILL_LOCK_KEY,
+    clear_properties_cache,
+    get_all_properties,
+)
+
+
+class PropertySerializerTests(SimpleTestCase):
+    def test_rows_round_trip(self):
+        rows = [
+            {
+                'id': 1,
+                'title': 'Downtown Apartment',
+                'description': 'Modern 2-bedroom apartment',
+                'price': Decimal('450000.00'),
+                'location': 'New York, NY',
+                'created_at': datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            }
+        ]
+
+        self.assertEqual(unpack_properties(pack_properties(rows)), rows)
+
+
+class PropertyCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Property.objects.create(
+            title='Mountain Cabin',
+            description='Cozy cabin in the mountains',
+            price=Decimal('280000.00'),
+            location='Denver, CO',
+        )
+
+    def test_get_all_properties_serves_same_rows_from_cache(self):
+        from_db = get_all_properties()
+        from_cache = get_all_properties()
+
+        self.assertEqual(from_cache, from_db)
+        self.assertEqual(from_cache[0]['price'], Decimal('280000.00'))
+
+    def test_legacy_cached_value_is_replaced(self):
+        # Value in the format cached before rows were msgpack-encoded
+        cache.set('all_properties', [{'title': 'Stale Listing'}], 3600)
+
+        properties = get_all_properties()
+
+        self.assertEqual(properties, utils._fetch_properties())
+        self.assertEqual(unpack_properties(cache.get('all_properties')), properties)
+
+    def test_cache_metrics_api_can_be_requested_twice(self):
+        url = reverse('properties:cache_metrics_api')
+
+        first = self.client.get(url)
+        second = self.client.get(url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_cache_metrics_api_etag(self):
+        url = reverse('properties:cache_metrics_api')
+        get_all_properties()
+
+        first = self.client.get(url)
+        self.assertTrue(first['ETag'].startswith('W/'))
+
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        clear_properties_cache()
+        # A distinct query string bypasses the 5 second page cache
+        after_clear = self.client.get(url, {'after': 'clear'})
+        self.assertEqual(after_clear.status_code, 200)
+        self.assertNotEqual(after_clear['ETag'], first['ETag'])
+
+
+class PropertyRefillLockTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Property.objects.create(
+            title='Country House',
+            description='Spacious country house with large garden',
+            price=Decimal('320000.00'),
+            location='Austin, TX',
+        )
+
+    def test_falls_back_to_database_while_another_worker_holds_lock(self):
+        cache.set(PROPERTIES_REFILL_LOCK_KEY, 'other-worker', 10)
+
+        with mock.patch.object(utils, 'PROPERTIES_REFILL_WAIT', 0):
+            properties = get_all_properties()
+
+        self.assertEqual(properties, utils._fetch_properties())
+        self.assertFalse(cache.has_key('all_properties'))
+        self.assertTrue(cache.has_key(PROPERTIES_REFILL_LOCK_KEY))
+
+    def test_lock_released_after_successful_fill(self):
+        get_all_properties()
+
+        self.assertTrue(cache.has_key('all_properties'))
+        self.assertFalse(cache.has_key(PROPERTIES_REFILL_LOCK_KEY))
+
+    def test_does_not_release_lock_taken_by_another_worker(self):
+        fetch_properties = utils._fetch_properties
+
+        def fetch_after_lock_expired():
+            # Simulate our lock expiring and another worker acquiring it
+            cache.set(PROPERTIES_REFILL_LOCK_KEY, 'other-worker', 10)
+            return fetch_properties()
+
+        with mock.patch.object(utils, '_fetch_properties', fetch_after_lock_expired):
+            get_all_properties()
+
+        self.assertEqual(cache.get(PROPERTIES_REFILL_LOCK_KEY), 'other-worker')
+
+
+class SeedPropertiesCommandTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_seed_clears_properties_cache_once_on_commit(self):
+        get_all_properties()
+        self.assertTrue(cache.has_key('all_properties'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('seed_properties', stdout=StringIO())
+
+        self.assertFalse(cache.has_key('all_properties'))
+        self.assertFalse(cache.has_key(PROPERTIES_COUNT_CACHE_KEY))
+
+    def test_seed_twice_creates_no_duplicates(self):
+        call_command('seed_properties', stdout=StringIO())
+        seeded = Property.objects.count()
+
+        call_command('seed_properties', stdout=StringIO())
+
+        self.assertEqual(Property.objects.count(), seeded)
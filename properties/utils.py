@@ -2,107 +2,185 @@ from django.core.cache import cache
 from django.db import models
 from django_redis import get_redis_connection
 from .models import Property
+from .serializers import pack_properties, unpack_properties
 import logging
 import math
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Short-lived memoization of the metrics snapshot so dashboard polling
+# does not hit Redis INFO/SCAN on every request
+METRICS_CACHE_KEY = 'metrics:redis_info'
+METRICS_CACHE_TTL = 10
+
+# Sibling key holding len(all_properties), so counts don't fetch the full list
+PROPERTIES_COUNT_CACHE_KEY = 'all_properties:count'
+
+# Only one worker refills all_properties after a miss; the others wait for it
+PROPERTIES_REFILL_LOCK_KEY = 'all_properties:lock'
+PROPERTIES_REFILL_LOCK_TTL = 10
+PROPERTIES_REFILL_WAIT = 1.0
+PROPERTIES_REFILL_POLL_INTERVAL = 0.05
+
+# Deletes the refill lock only if it still holds the caller's token, so a
+# worker whose lock expired can't release one another worker has taken since
+_RELEASE_REFILL_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# INFO sections read by _fetch_redis_cache_metrics, in unpacking order
+REDIS_INFO_SECTIONS = ('stats', 'memory', 'server', 'clients')
+
+# Redis SET tracking the property cache keys currently populated
+PROPERTIES_CACHE_INDEX = 'property_listings:index'
+
+
 # if total_requests > 0 else 0
 
-def get_redis_cache_metrics():
+def _empty_cache_metrics(error):
     """
-    Retrieve and analyze Redis cache hit/miss metrics.
+    Zeroed metrics returned when Redis cannot be queried
+    """
+    return {
+        'error': str(error),
+        'keyspace_hits': 0,
+        'keyspace_misses': 0,
+        'total_operations': 0,
+        'hit_ratio': 0,
+        'hit_ratio_percentage': 0,
+        'miss_ratio': 0,
+        'miss_ratio_percentage': 0,
+        'used_memory': 0,
+        'used_memory_human': '0B',
+        'cached_keys_count': 0,
+        'redis_version': 'unknown',
+        'connected_clients': 0,
+        'uptime_in_seconds': 0,
+        'uptime_in_days': 0,
+    }
+
+def _fetch_redis_cache_metrics(redis_conn):
+    """
+    Query Redis for fresh metrics and memoize them for METRICS_CACHE_TTL seconds
+    """
+    # Request only the INFO sections we read, plus the key count,
+    # in a single round trip
+    pipe = redis_conn.pipeline(transaction=False)
+    for section in REDIS_INFO_SECTIONS:
+        pipe.info(section)
+    pipe.scard(PROPERTIES_CACHE_INDEX)
+    *sections, keys_count = pipe.execute(raise_on_error=False)
+    for section in sections:
+        if isinstance(section, Exception):
+            raise section
+    stats, memory_stats, server_info, clients_info = sections
+    
+    # Get keyspace hits and misses
+    keyspace_hits = stats.get('keyspace_hits', 0)
+    keyspace_misses = stats.get('keyspace_misses', 0)
+    
+    # Calculate total operations and hit ratio
+    total_operations = keyspace_hits + keyspace_misses
+    hit_ratio = keyspace_hits / total_operations if total_operations > 0 else 0
+    
+    # Get memory usage
+    used_memory = memory_stats.get('used_memory', 0)
+    used_memory_human = memory_stats.get('used_memory_human', '0B')
+    
+    # Key count tracked in the property cache index
+    if isinstance(keys_count, Exception):
+        keys_count = 0
+    
+    # Get additional cache stats
+    cache_stats = {
+        'keyspace_hits': keyspace_hits,
+        'keyspace_misses': keyspace_misses,
+        'total_operations': total_operations,
+        'hit_ratio': hit_ratio,
+        'hit_ratio_percentage': round(hit_ratio * 100, 2),
+        'miss_ratio': 1 - hit_ratio if total_operations > 0 else 0,
+        'miss_ratio_percentage': round((1 - hit_ratio) * 100, 2) if total_operations > 0 else 0,
+        'used_memory': used_memory,
+        'used_memory_human': used_memory_human,
+        'cached_keys_count': keys_count,
+        'redis_version': server_info.get('redis_version', 'unknown'),
+        'connected_clients': clients_info.get('connected_clients', 0),
+        'uptime_in_seconds': server_info.get('uptime_in_seconds', 0),
+        'uptime_in_days': server_info.get('uptime_in_days', 0),
+    }
+    
+    # Log the metrics
+    logger.info(
+        f"📊 Redis Cache Metrics: "
+        f"Hits: {keyspace_hits}, "
+        f"Misses: {keyspace_misses}, "
+        f"Hit Ratio: {cache_stats['hit_ratio_percentage']}%, "
+        f"Cached Keys: {keys_count}"
+    )
+    
+    cache.set(METRICS_CACHE_KEY, cache_stats, METRICS_CACHE_TTL)
+    return cache_stats
+
+def collect_all_metrics():
+    """
+    Gather everything the cache metrics views display in a single Redis
+    round trip (plus one more when the metrics snapshot has expired).
+    This is the only reader of the METRICS_CACHE_KEY snapshot.
     
     Returns:
-        dict: Cache metrics including hits, misses, hit ratio, and other stats
+        dict: metrics, analysis, properties_cached and cached_properties_count
     """
+    cache_key = 'all_properties'
+    
     try:
-        # Get Redis connection
         redis_conn = get_redis_connection("default")
         
-        # Get Redis INFO command output
-        info = redis_conn.info()
+        pipe = redis_conn.pipeline(transaction=False)
+        pipe.get(cache.make_key(METRICS_CACHE_KEY))
+        pipe.exists(cache.make_key(cache_key))
+        pipe.get(cache.make_key(PROPERTIES_COUNT_CACHE_KEY))
+        raw_metrics, properties_cached, raw_count = pipe.execute()
         
-        # Extract cache statistics
-        stats = info.get('stats', {})
-        
-        # Get keyspace hits and misses
-        keyspace_hits = stats.get('keyspace_hits', 0)
-        keyspace_misses = stats.get('keyspace_misses', 0)
-        
-        # Calculate total operations and hit ratio
-        total_operations = keyspace_hits + keyspace_misses
-        hit_ratio = keyspace_hits / total_operations if total_operations > 0 else 0
-        
-        # Get memory usage
-        memory_stats = info.get('memory', {})
-        used_memory = memory_stats.get('used_memory', 0)
-        used_memory_human = memory_stats.get('used_memory_human', '0B')
-        
-        # Get key count for our cache pattern
-        keys_count = 0
-        try:
-            # Count keys with our prefix
-            pattern = "property_listings:*"
-            keys_count = len(redis_conn.keys(pattern))
-        except:
-            pass
-        
-        # Get additional cache stats
-        cache_stats = {
-            'keyspace_hits': keyspace_hits,
-            'keyspace_misses': keyspace_misses,
-            'total_operations': total_operations,
-            'hit_ratio': hit_ratio,
-            'hit_ratio_percentage': round(hit_ratio * 100, 2),
-            'miss_ratio': 1 - hit_ratio if total_operations > 0 else 0,
-            'miss_ratio_percentage': round((1 - hit_ratio) * 100, 2) if total_operations > 0 else 0,
-            'used_memory': used_memory,
-            'used_memory_human': used_memory_human,
-            'cached_keys_count': keys_count,
-            'redis_version': info.get('redis_version', 'unknown'),
-            'connected_clients': info.get('connected_clients', 0),
-            'uptime_in_seconds': info.get('uptime_in_seconds', 0),
-            'uptime_in_days': info.get('uptime_in_days', 0),
-        }
-        
-        # Log the metrics
-        logger.info(
-            f"📊 Redis Cache Metrics: "
-            f"Hits: {keyspace_hits}, "
-            f"Misses: {keyspace_misses}, "
-            f"Hit Ratio: {cache_stats['hit_ratio_percentage']}%, "
-            f"Cached Keys: {keys_count}"
-        )
+        if raw_metrics is not None:
+            metrics = cache.client.decode(raw_metrics)
+        else:
+            metrics = _fetch_redis_cache_metrics(redis_conn)
         
-        return cache_stats
+        properties_cached = bool(properties_cached)
+        cached_count = cache.client.decode(raw_count) if raw_count is not None else None
         
     except Exception as e:
-        logger.error(f"❌ Error retrieving Redis cache metrics: {e}")
-        return {
-            'error': str(e),
-            'keyspace_hits': 0,
-            'keyspace_misses': 0,
-            'total_operations': 0,
-            'hit_ratio': 0,
-            'hit_ratio_percentage': 0,
-            'miss_ratio': 0,
-            'miss_ratio_percentage': 0,
-            'used_memory': 0,
-            'used_memory_human': '0B',
-            'cached_keys_count': 0,
-            'redis_version': 'unknown',
-            'connected_clients': 0,
-            'uptime_in_seconds': 0,
-            'uptime_in_days': 0,
-        }
+        logger.error(f"❌ Error collecting cache metrics: {e}")
+        metrics = _empty_cache_metrics(e)
+        properties_cached = False
+        cached_count = None
+    
+    return {
+        'metrics': metrics,
+        'analysis': get_cache_performance_analysis(metrics),
+        'properties_cached': properties_cached,
+        'cached_properties_count': cached_count,
+    }
+
+# (minimum hit ratio, performance level, status, recommendation), highest first
+_PERFORMANCE_THRESHOLDS = (
+    (0.9, 'Excellent', 'success', 'Cache is performing very well. Consider increasing cache TTL for frequently accessed data.'),
+    (0.7, 'Good', 'info', 'Cache performance is good. Monitor for any degradation.'),
+    (0.5, 'Fair', 'warning', 'Consider optimizing cache keys or increasing TTL for better performance.'),
+    (float('-inf'), 'Poor', 'error', 'Cache hit ratio is low. Review caching strategy and data access patterns.'),
+)
 
 def get_cache_performance_analysis(metrics):
     """
     Analyze cache performance and provide recommendations.
     
     Args:
-        metrics (dict): Cache metrics from get_redis_cache_metrics()
+        metrics (dict): Cache metrics from collect_all_metrics()
     
     Returns:
         dict: Performance analysis and recommendations
@@ -121,22 +199,12 @@ def get_cache_performance_analysis(metrics):
     }
     
     # Performance level based on hit ratio
-    if hit_ratio >= 0.9:
-        analysis['performance_level'] = 'Excellent'
-        analysis['status'] = 'success'
-        analysis['recommendations'].append('Cache is performing very well. Consider increasing cache TTL for frequently accessed data.')
-    elif hit_ratio >= 0.7:
-        analysis['performance_level'] = 'Good'
-        analysis['status'] = 'info'
-        analysis['recommendations'].append('Cache performance is good. Monitor for any degradation.')
-    elif hit_ratio >= 0.5:
-        analysis['performance_level'] = 'Fair'
-        analysis['status'] = 'warning'
-        analysis['recommendations'].append('Consider optimizing cache keys or increasing TTL for better performance.')
-    else:
-        analysis['performance_level'] = 'Poor'
-        analysis['status'] = 'error'
-        analysis['recommendations'].append('Cache hit ratio is low. Review caching strategy and data access patterns.')
+    _, level, status, recommendation = next(
+        t for t in _PERFORMANCE_THRESHOLDS if hit_ratio >= t[0]
+    )
+    analysis['performance_level'] = level
+    analysis['status'] = status
+    analysis['recommendations'].append(recommendation)
     
     # Additional recommendations based on other metrics
     if total_operations < 100:
@@ -149,111 +217,117 @@ def get_cache_performance_analysis(metrics):
     
     return analysis
 
-# Keep existing functions (get_all_properties, clear_properties_cache, etc.)
-def get_all_properties():
+PROPERTY_CACHE_FIELDS = ('id', 'title', 'description', 'price', 'location', 'created_at')
+
+def _fetch_properties():
     """
-    Fetch all properties from cache if available, otherwise from database.
-    Caches the queryset for 1 hour (3600 seconds).
-    
-    Returns:
-        QuerySet: All Property objects
+    Evaluate all properties into plain dicts so cached values never hold a QuerySet
     """
-    cache_key = 'all_properties'
+    return list(
+        Property.objects.all().order_by('-created_at').values(*PROPERTY_CACHE_FIELDS)
+    )
+
+def _decode_cached_properties(cache_key, packed):
+    """
+    Unpack a cached all_properties value, treating anything that isn't
+    msgpack-encoded rows (e.g. a QuerySet or list left by an older release)
+    as a miss and deleting it so the refill path rewrites it
+    """
+    if packed is None:
+        return None
     
     try:
-        # Try to get properties from cache
-        properties = cache.get(cache_key)
-        
-        if properties is None:
-            # Cache miss - fetch from database
-            logger.info("🔄 Cache miss: Fetching properties from database")
-            properties = Property.objects.all().order_by('-created_at')
-            
-            # Store in cache for 1 hour (3600 seconds)
-            cache.set(cache_key, properties, 3600)
-            logger.info(f"✅ Cached {properties.count()} properties for 1 hour")
-        else:
-            logger.info("✅ Cache hit: Serving properties from Redis")
-        
-        return properties
-        
-    except Exception as e:
-        logger.error(f"❌ Error in get_all_properties: {e}")
-        # Fallback to database query
-        return Property.objects.all().order_by('-created_at')
+        properties = unpack_properties(packed)
+        if isinstance(properties, list):
+            return properties
+    except Exception:
+        pass
+    
+    logger.warning(f"⚠️ Discarding undecodable '{cache_key}' cache value")
+    cache.delete(cache_key)
+    return None
 
-def clear_properties_cache():
+def _acquire_refill_lock():
     """
-    Clear the cached properties from Redis
+    Try to take the all_properties refill lock
+    
+    Returns:
+        str: Token identifying this holder, or None if another worker holds the lock
     """
-    try:
-        cache_key = 'all_properties'
-        if cache.has_key(cache_key):
-            cache.delete(cache_key)
-            logger.info("🗑️ Properties cache cleared")
-            return True
-        else:
-            logger.info("ℹ️ Properties cache was already empty")
-            return True
-    except Exception as e:
-        logger.error(f"❌ Error clearing properties cache: {e}")
-        return False
+    token = uuid.uuid4().hex
+    acquired = get_redis_connection("default").set(
+        cache.make_key(PROPERTIES_REFILL_LOCK_KEY), token,
+        nx=True, ex=PROPERTIES_REFILL_LOCK_TTL,
+    )
+    return token if acquired else None
 
-def get_cached_properties_count():
+def _release_refill_lock(token):
     """
-    Get the number of properties from cache without fetching the entire queryset
+    Release the refill lock if it is still held with this token
     """
-    try:
-        cache_key = 'all_properties'
-        properties = cache.get(cache_key)
-        
-        if properties is not None:
-            return len(properties)
-        return None
-    except Exception as e:
-        logger.error(f"❌ Error getting cached properties count: {e}")
-        return None
+    get_redis_connection("default").eval(
+        _RELEASE_REFILL_LOCK_SCRIPT, 1, cache.make_key(PROPERTIES_REFILL_LOCK_KEY), token
+    )
 
-def refresh_properties_cache():
+def _store_properties(cache_key, properties, timeout):
     """
-    Force refresh the properties cache
+    Write the packed rows, their count and the cache index entry in one
+    round trip, expiring the index alongside the cached value so the
+    count can't outlive it
     """
-    clear_properties_cache()
-    return get_all_properties()
+    pipe = get_redis_connection("default").pipeline(transaction=False)
+    pipe.set(cache.make_key(cache_key), cache.client.encode(pack_properties(properties)), ex=timeout)
+    pipe.set(cache.make_key(PROPERTIES_COUNT_CACHE_KEY), cache.client.encode(len(properties)), ex=timeout)
+    pipe.sadd(PROPERTIES_CACHE_INDEX, cache_key)
+    pipe.expire(PROPERTIES_CACHE_INDEX, timeout)
+    pipe.execute()
 
-def is_properties_cached():
+def _wait_for_properties_refill(cache_key):
     """
-    Check if properties are currently cached
+    Poll the cache while another worker refills it, falling back to the
+    database if the refill does not land within PROPERTIES_REFILL_WAIT seconds
     """
-    try:
-        cache_key = 'all_properties'
-        return cache.has_key(cache_key)
-    except Exception as e:
-        logger.error(f"❌ Error checking cache status: {e}")
-        return False
+    deadline = time.monotonic() + PROPERTIES_REFILL_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(PROPERTIES_REFILL_POLL_INTERVAL)
+        properties = _decode_cached_properties(cache_key, cache.get(cache_key))
+        if properties is not None:
+            logger.info("✅ Cache hit: Serving properties refilled by another worker")
+            return properties
+    
+    logger.info("🔄 Cache refill still pending: Fetching properties from database")
+    return _fetch_properties()
 
 def get_all_properties():
     """
     Fetch all properties from cache if available, otherwise from database.
-    Caches the queryset for 1 hour (3600 seconds).
+    Caches the evaluated rows for 1 hour (3600 seconds).
     
     Returns:
-        QuerySet: All Property objects
+        list: All properties as dicts, newest first
     """
     cache_key = 'all_properties'
     
     try:
-        # Try to get properties from cache
-        properties = cache.get(cache_key)
+        # Try to get properties from cache (stored as msgpack-encoded rows)
+        properties = _decode_cached_properties(cache_key, cache.get(cache_key))
         
         if properties is None:
-            # Cache miss - fetch from database
-            logger.info("🔄 Cache miss: Fetching properties from database")
-            properties = Property.objects.all().order_by('-created_at')
-            
-            # Store in cache for 1 hour (3600 seconds)
-            cache.set(cache_key, properties, 3600)
-            logger.info(f"✅ Cached {properties.count()} properties for 1 hour")
+            lock_token = _acquire_refill_lock()
+            if lock_token is not None:
+                # Cache miss and we hold the refill lock - fetch from database
+                try:
+                    logger.info("🔄 Cache miss: Fetching properties from database")
+                    properties = _fetch_properties()
+                    
+                    # Store in cache for 1 hour (3600 seconds)
+                    _store_properties(cache_key, properties, 3600)
+                    logger.info(f"✅ Cached {len(properties)} properties for 1 hour")
+                finally:
+                    _release_refill_lock(lock_token)
+            else:
+                # Another worker is refilling - wait briefly for its result
+                properties = _wait_for_properties_refill(cache_key)
         else:
             logger.info("✅ Cache hit: Serving properties from Redis")
         
@@ -262,36 +336,39 @@ def get_all_properties():
     except Exception as e:
         logger.error(f"❌ Error in get_all_properties: {e}")
         # Fallback to database query
-        return Property.objects.all().order_by('-created_at')
+        return _fetch_properties()
 
 def clear_properties_cache():
     """
     Clear the cached properties from Redis
+    
+    Returns:
+        int: Number of cache keys deleted, or None if Redis could not be reached
     """
     try:
         cache_key = 'all_properties'
-        if cache.has_key(cache_key):
-            cache.delete(cache_key)
+        
+        # Drop the index entry and delete the cached keys in one round trip;
+        # DEL reports how many keys existed, so no separate has_key check
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        pipe.srem(PROPERTIES_CACHE_INDEX, cache_key)
+        pipe.delete(cache.make_key(cache_key), cache.make_key(PROPERTIES_COUNT_CACHE_KEY))
+        _, deleted = pipe.execute()
+        if deleted:
             logger.info("🗑️ Properties cache cleared")
-            return True
         else:
             logger.info("ℹ️ Properties cache was already empty")
-            return True
+        return deleted
     except Exception as e:
         logger.error(f"❌ Error clearing properties cache: {e}")
-        return False
+        return None
 
 def get_cached_properties_count():
     """
-    Get the number of properties from cache without fetching the entire queryset
+    Get the number of properties from cache without fetching the cached list
     """
     try:
-        cache_key = 'all_properties'
-        properties = cache.get(cache_key)
-        
-        if properties is not None:
-            return len(properties)
-        return None
+        return cache.get(PROPERTIES_COUNT_CACHE_KEY)
     except Exception as e:
         logger.error(f"❌ Error getting cached properties count: {e}")
         return None
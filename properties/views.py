@@ -1,16 +1,19 @@
 from django.shortcuts import render, redirect
 from django.views.decorators.cache import never_cache
 from django.views.decorators.cache import cache_page
+from django.views.decorators.http import conditional_page
+from django.views.decorators.vary import vary_on_headers
 from django.http import JsonResponse
 from .utils import (
     get_all_properties, 
     get_cached_properties_count, 
     clear_properties_cache, 
     is_properties_cached,
-    get_redis_cache_metrics,
-    get_cache_performance_analysis
+    collect_all_metrics
 )
 from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import quote_etag
 from .models import Property
 
 def property_list(request):
@@ -27,7 +30,7 @@ def property_list(request):
     
     context = {
         'properties': properties,
-        'total_properties': properties.count(),
+        'total_properties': len(properties),
         'is_cached': is_cached,
         'cache_key': cache_key,
         'cached_count': cached_count,
@@ -46,11 +49,12 @@ def property_list_uncached(request):
     """
     Alternative view that never uses cache (for testing)
     """
-    properties = Property.objects.all().order_by('-created_at')
+    # Evaluate once so the count doesn't issue a separate COUNT(*) query
+    properties = list(Property.objects.all().order_by('-created_at'))
     
     context = {
         'properties': properties,
-        'total_properties': properties.count(),
+        'total_properties': len(properties),
         'is_cached': False,
         'cache_key': 'none',
     }
@@ -78,22 +82,6 @@ def create_sample_property(request):
     
     return render(request, 'properties/create_sample.html')
 
-@never_cache
-def property_list_uncached(request):
-    """
-    Alternative view that never uses cache (for testing)
-    """
-    properties = Property.objects.all().order_by('-created_at')
-    
-    context = {
-        'properties': properties,
-        'total_properties': properties.count(),
-        'is_cached': False,
-        'cache_key': 'none',
-    }
-    
-    return render(request, 'properties/property_list.html', context)
-
 def property_detail(request, property_id):
     cache_key = f'property_{property_id}'
     property_obj = cache.get(cache_key)
@@ -108,66 +96,42 @@ def property_detail(request, property_id):
     return render(request, 'properties/detail.html', {'property': property_obj})
 
 
-@cache_page(60 * 15)  # Cache for 15 minutes (900 seconds)
-def property_list(request):
-    """
-    View to display all properties with response cached for 15 minutes
-    """
-    properties = Property.objects.all().order_by('-created_at')
-    
-    # Check if response is served from cache
-    cache_key = f"property_list_page_{request.get_full_path()}"
-    is_cached = cache.has_key(cache_key)
-    
-    context = {
-        'properties': properties,
-        'total_properties': properties.count(),
-        'is_cached': is_cached,
-        'cache_key': cache_key,
-    }
-    
-    return render(request, 'properties/property_list.html', context)
-
-
 def cache_metrics(request):
     """
     View to display Redis cache metrics and performance analysis
     """
-    metrics = get_redis_cache_metrics()
-    analysis = get_cache_performance_analysis(metrics)
-    
-    context = {
-        'metrics': metrics,
-        'analysis': analysis,
-        'properties_cached': is_properties_cached(),
-        'cached_properties_count': get_cached_properties_count(),
-    }
-    
     # Handle cache clearing
     if request.GET.get('clear_cache') == 'true':
         clear_properties_cache()
-        context['cache_cleared'] = True
         return redirect('properties:cache_metrics')
     
     # Handle cache refresh
     if request.GET.get('refresh_cache') == 'true':
         get_all_properties()  # This will refresh the cache
-        context['cache_refreshed'] = True
         return redirect('properties:cache_metrics')
     
+    # Only gather metrics once we know the page will be rendered
+    context = collect_all_metrics()
+    
     return render(request, 'properties/cache_metrics.html', context)
 
+@conditional_page
+@cache_page(5)
+@vary_on_headers('Accept')
 def cache_metrics_api(request):
     """
-    API endpoint to get cache metrics in JSON format
+    API endpoint to get cache metrics in JSON format.
+    The response is cached for 5 seconds and carries an ETag so pollers
+    receive 304 Not Modified while the hit/miss counters are unchanged.
     """
-    metrics = get_redis_cache_metrics()
-    analysis = get_cache_performance_analysis(metrics)
-    
-    return JsonResponse({
-        'metrics': metrics,
-        'analysis': analysis,
-        'properties_cached': is_properties_cached(),
-        'cached_properties_count': get_cached_properties_count(),
-        'timestamp': timezone.now().isoformat(),
-    })
\ No newline at end of file
+    data = collect_all_metrics()
+    data['timestamp'] = timezone.now().isoformat()
+    
+    metrics = data['metrics']
+    response = JsonResponse(data)
+    # Weak validator: the counters match but timestamp, memory and uptime
+    # in the body may differ
+    response['ETag'] = 'W/' + quote_etag(
+        f"{metrics['keyspace_hits']}-{metrics['keyspace_misses']}-{data['cached_properties_count']}"
+    )
+    return response
\ No newline at end of file